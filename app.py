@@ -3,9 +3,11 @@ Streamlit application for Cryptocurrency Dashboard.
 Main view layer that coordinates with controller and view.
 """
 
+import numpy as np
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 
 from controller.controller import (
     get_live_data,
@@ -15,11 +17,79 @@ from controller.controller import (
 )
 from view.view import create_candlestick_chart, MarketDataFormatter as fmt
 
-# Cache live data for 60 seconds
-@st.cache_data(ttl=60)
+# Dashboard description shown under the title
+INTRO_MD = """
+Get **real-time cryptocurrency data** powered by **CoinGecko API**.
+
+Track **live prices**, analyze **historical trends** with **candlestick charts**, 
+and switch between **USD and EUR**.
+
+### How to use:
+1️⃣ **Choose a Currency** - Select **USD or EUR** from the sidebar.  
+2️⃣ **Select a Cryptocurrency** - Pick from the available options.  
+3️⃣ **Adjust Time Range** - Choose a period for historical price analysis.
+"""
+
+# Currency codes shown in the UI for each selectable currency
+_CURRENCY_CODES = {"usd": "USD", "eur": "EUR"}
+_CURRENCY_CHOICES = tuple(_CURRENCY_CODES)
+
+# Time ranges offered in the sidebar (excludes "max")
+_OHLC_CHOICES = tuple(VALID_OHLC_DAYS[:-1])
+
+# Streamlit number format presets for prices in each currency
+_PRICE_FORMATS = {"USD": "dollar", "EUR": "euro"}
+
+# Source column -> display column for the live prices table
+_COLUMN_MAPPING = {
+    'market_cap_rank': 'Rank',
+    'name': 'name',
+    'image': 'image',
+    'symbol': 'symbol',
+    'current_price': 'current_price',
+    'market_cap': 'market_cap',
+    'circulating_supply': 'Circulating Supply',
+    'total_volume': 'total_volume',
+    'ath': 'All Time High',
+    'ath_date': 'All Time High Date'
+}
+
+# Freshness window for live prices, in seconds
+LIVE_DATA_TTL = 60
+
+# Shared by all sessions, so no session_state writes here; returns data, coin names and fetch time
+@st.cache_data(ttl=LIVE_DATA_TTL)
 def get_cached_live_data(currency):
-    st.session_state.last_refresh_time = datetime.now()
-    return get_live_data(currency)
+    live_data = get_live_data(currency)
+    if live_data is None:
+        return None, (), None
+    fetched_at = live_data.attrs.get("fetched_at", datetime.now())
+    return live_data, tuple(live_data['name']), fetched_at
+
+# Keep a per-session reference to the live data so reruns within the TTL
+# skip the cache lookup (and the copy st.cache_data hands back on every hit).
+# The entry expires LIVE_DATA_TTL after the data was fetched, not after it was read.
+def get_session_live_data(currency):
+    key = f"live_data_{currency}"
+    entry = st.session_state.get(key)
+    if entry is None or datetime.now() >= entry[2] + timedelta(seconds=LIVE_DATA_TTL):
+        live_data, available_coins, fetched_at = get_cached_live_data(currency)
+        if live_data is None:
+            return None, ()
+        entry = (live_data, available_coins, fetched_at)
+        st.session_state[key] = entry
+    st.session_state.last_refresh_time = entry[2]
+    return entry[0], entry[1]
+
+# Cache historical OHLC data for 5 minutes, shared across sessions like the live data;
+# the chart shows its own loading spinner. Failures raise, since st.cache_data does not
+# store exceptions and the next rerun should retry instead of serving a cached None.
+@st.cache_data(ttl=300, show_spinner=False)
+def get_cached_candlestick_data(coin_id, currency, days):
+    data = get_candlestick_data(coin_id, currency, days)
+    if data is None:
+        raise RuntimeError(f"Could not fetch OHLC data for {coin_id}")
+    return data
 
 def run_app():
     st.set_page_config(
@@ -36,141 +106,124 @@ def run_app():
     with col1:
         st.title("📈 Cryptocurrency Market Dashboard")
     with col3:
-        # Chat popover button
-        with st.popover("💬 Chat", width="stretch"):
-            if "chat_history" not in st.session_state:
-                st.session_state.chat_history = []
-
-            for msg in st.session_state.chat_history:
-                with st.chat_message(msg["role"]):
-                    st.markdown(msg["content"])
-
-            if prompt := st.chat_input("Ask about cryptocurrencies..."):
-                st.session_state.chat_history.append({"role": "user", "content": prompt})
-                with st.chat_message("user"):
-                    st.markdown(prompt)
-
-                with st.chat_message("assistant"):
-                    with st.spinner("Thinking..."):
-                        live_data = st.session_state.get("live_data", None)
-                        currency = st.session_state.get("selected_currency", "usd")
-                        response = ask_chatbot(prompt, live_data, currency.upper())
-                        st.markdown(response)
-                st.session_state.chat_history.append({"role": "assistant", "content": response})
-                st.rerun()
+        chat_fragment()
 
     # ---- Main dashboard description ----
-    st.markdown("""
-    Get **real-time cryptocurrency data** powered by **CoinGecko API**.
-
-    Track **live prices**, analyze **historical trends** with **candlestick charts**, 
-    and switch between **USD and EUR**.
-
-    ### How to use:
-    1️⃣ **Choose a Currency** - Select **USD or EUR** from the sidebar.  
-    2️⃣ **Select a Cryptocurrency** - Pick from the available options.  
-    3️⃣ **Adjust Time Range** - Choose a period for historical price analysis.
-    """)
+    st.markdown(INTRO_MD)
 
     # ---- Sidebar ----
     with st.sidebar:
         st.header("Settings")
-        selected_currency = st.selectbox("Select Currency", ["usd", "eur"])
+        selected_currency = st.selectbox("Select Currency", _CURRENCY_CHOICES)
         st.session_state.selected_currency = selected_currency
-        currency_symbol = {"usd": "USD", "eur": "EUR"}[selected_currency]
 
-        live_data = get_cached_live_data(selected_currency)
+        live_data, available_coins = get_session_live_data(selected_currency)
         if live_data is None:
             st.warning("⚠️ CoinGecko API rate limit reached. Try again in a few minutes.")
             st.stop()
 
         st.session_state.live_data = live_data
 
-        available_coins = live_data['name'].tolist()
         selected_coin = st.selectbox("Select Cryptocurrency", available_coins).lower()
 
         st.subheader("Historical Data")
         selected_days = st.selectbox(
             "Select Time Range (days)",
-            VALID_OHLC_DAYS[:-1],  # Exclude "max"
+            _OHLC_CHOICES,
             help="Choose the time period for historical price analysis"
         )
 
     # ---- Main content ----
     if live_data is not None:
-        display_live_data(live_data, currency_symbol)
+        live_prices_fragment(selected_currency)
         display_candlestick_chart(selected_coin, selected_currency, selected_days)
 
+@st.fragment
+def chat_fragment():
+    # Chat popover button; sending a message only reruns this fragment
+    with st.popover("💬 Chat", width="stretch"):
+        if "chat_history" not in st.session_state:
+            st.session_state.chat_history = []
+
+        for msg in st.session_state.chat_history:
+            with st.chat_message(msg["role"]):
+                st.markdown(msg["content"])
+
+        if prompt := st.chat_input("Ask about cryptocurrencies..."):
+            st.session_state.chat_history.append({"role": "user", "content": prompt})
+            with st.chat_message("user"):
+                st.markdown(prompt)
+
+            with st.chat_message("assistant"):
+                with st.spinner("Thinking..."):
+                    live_data = st.session_state.get("live_data", None)
+                    currency = st.session_state.get("selected_currency", "usd")
+                    response = ask_chatbot(prompt, live_data, currency.upper())
+                    st.markdown(response)
+            st.session_state.chat_history.append({"role": "assistant", "content": response})
+            st.rerun(scope="fragment")
+
+# Refresh the live prices table on its own every minute, without rerunning the whole app
+@st.fragment(run_every=LIVE_DATA_TTL)
+def live_prices_fragment(currency):
+    live_data, _ = get_session_live_data(currency)
+    if live_data is None:
+        st.warning("⚠️ CoinGecko API rate limit reached. Try again in a few minutes.")
+        return
+
+    st.session_state.live_data = live_data
+    display_live_data(live_data, _CURRENCY_CODES[currency])
+
 def display_live_data(live_data, currency_symbol):
     st.subheader("Live Cryptocurrency Prices")
     last_refresh = st.session_state.last_refresh_time
     st.caption(f'Last refreshed: {last_refresh.strftime("%Y-%m-%d %H:%M:%S")}')
 
-    display_df = prepare_live_data_table(live_data, currency_symbol)
-
-    symbol = "$" if currency_symbol == "USD" else "€"
+    display_df = prepare_live_data_table(live_data)
 
     st.dataframe(
         display_df,
-        column_config={
-            "Rank": st.column_config.NumberColumn("Rank", format="%d"),
-            "name": st.column_config.TextColumn("Name"),
-            "image": st.column_config.ImageColumn("Logo", width="small"),
-            "symbol": st.column_config.TextColumn("Symbol"),
-            "current_price": st.column_config.TextColumn(f"Price ({currency_symbol})"),
-            "market_cap": st.column_config.TextColumn("Market Cap"),
-            "total_volume": st.column_config.TextColumn("Total Volume"),
-            "Circulating Supply": st.column_config.TextColumn("Circulating Supply"),
-            "All Time High": st.column_config.TextColumn(f"All Time High ({currency_symbol})"),
-            "All Time High Date": st.column_config.DateColumn("ATH Date", format="YYYY-MM-DD"),
-        },
+        column_config=_live_table_column_config(currency_symbol),
         hide_index=True,
         width="stretch"
     )
 
-def prepare_live_data_table(data, currency_symbol):
-    df = data.copy()
-
-    column_mapping = {
-        'market_cap_rank': 'Rank',
-        'name': 'name',
-        'image': 'image',
-        'symbol': 'symbol',
-        'current_price': 'current_price',
-        'market_cap': 'market_cap',
-        'circulating_supply': 'Circulating Supply',
-        'total_volume': 'total_volume',
-        'ath': 'All Time High',
-        'ath_date': 'All Time High Date'
+# The column config only depends on the currency, so build it once per currency
+@lru_cache(maxsize=None)
+def _live_table_column_config(currency_symbol):
+    # Numbers stay numeric (and sortable); the front-end applies the formatting
+    price_format = _PRICE_FORMATS[currency_symbol]
+    return {
+        "Rank": st.column_config.NumberColumn("Rank", format="%d"),
+        "name": st.column_config.TextColumn("Name"),
+        "image": st.column_config.ImageColumn("Logo", width="small"),
+        "symbol": st.column_config.TextColumn("Symbol"),
+        "current_price": st.column_config.NumberColumn(f"Price ({currency_symbol})", format=price_format),
+        "market_cap": st.column_config.NumberColumn("Market Cap", format="localized"),
+        "total_volume": st.column_config.NumberColumn("Total Volume", format="localized"),
+        "Circulating Supply": st.column_config.NumberColumn("Circulating Supply", format="localized"),
+        "All Time High": st.column_config.NumberColumn(f"All Time High ({currency_symbol})", format=price_format),
+        "All Time High Date": st.column_config.DateColumn("ATH Date", format="YYYY-MM-DD"),
     }
 
-    display_columns = [col for col in column_mapping.keys() if col in df.columns]
-    df = df[display_columns]
-    df = df.rename(columns=column_mapping)
+# Table preparation is pure, so cache it for the same window as the live data
+@st.cache_data(ttl=LIVE_DATA_TTL)
+def prepare_live_data_table(data):
+    # Build the display frame from the retained columns only, without copying the whole input
+    available = set(data.columns)
+    df = pd.DataFrame({
+        display_name: data[col].array
+        for col, display_name in _COLUMN_MAPPING.items()
+        if col in available
+    }, copy=False)
 
     # Format dates
     if 'All Time High Date' in df.columns:
-        df['All Time High Date'] = pd.to_datetime(df['All Time High Date']).dt.date
-
-    # --- Formatting numerical columns ---
-    symbol = "$" if currency_symbol == "USD" else "€"
-
-    # Columns with 2 decimals and symbol
-    for col in ['current_price', 'All Time High']:
-        if col in df.columns:
-            df[col] = df[col].apply(lambda x: f"{symbol}{x:,.2f}")
-
-    # Columns with 0 decimals and symbol
-    for col in ['market_cap', 'total_volume']:
-        if col in df.columns:
-            df[col] = df[col].apply(lambda x: f"{x:,.0f}")
-
-    # Circulating Supply: without symbol, two decimal places
-    if 'Circulating Supply' in df.columns:
-        df['Circulating Supply'] = df['Circulating Supply'].apply(lambda x: f"{x:,.2f}")
+        df['All Time High Date'] = df['All Time High Date'].dt.date
 
     return df
 
+@st.fragment
 def display_candlestick_chart(coin_id, currency, days):
     if days == 1:
         st.subheader(f"{coin_id.capitalize()} Price Chart - Last 24 Hours")
@@ -190,19 +243,26 @@ def display_candlestick_chart(coin_id, currency, days):
     )
 
     with st.spinner(f"Loading {days}-day data for {coin_id}..."):
-        candlestick_data = get_candlestick_data(coin_id, currency, days)
+        try:
+            candlestick_data = get_cached_candlestick_data(coin_id, currency, days)
+        except RuntimeError:
+            candlestick_data = None
 
     if candlestick_data is not None and not candlestick_data.empty:
         chart = create_candlestick_chart(candlestick_data, coin_id, currency.upper())
         st.plotly_chart(chart, width="stretch")
 
+        # Pull the OHLC values out once and compute every metric from the same array
+        ohlc = candlestick_data[['open', 'high', 'low', 'close']].to_numpy()
+        first_open, latest_close = ohlc[0, 0], ohlc[-1, 3]
+        highest, lowest = np.nanmax(ohlc[:, 1]), np.nanmin(ohlc[:, 2])  # skip missing values like pandas did
+
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            latest_close = candlestick_data['close'].iloc[-1]
             st.metric("💰 Latest Close (Period End)", fmt.format_price(latest_close, currency))
         with col2:
-            price_change = candlestick_data['close'].iloc[-1] - candlestick_data['open'].iloc[0]
-            change_pct = (price_change / candlestick_data['open'].iloc[0]) * 100
+            price_change = latest_close - first_open
+            change_pct = (price_change / first_open) * 100
             sign = "+" if price_change >= 0 else "-"
             period_label = "📈 Period Change (last 24 Hours)" if days == 1 else f"📈 Period Change (last {days} Days)"
             st.metric(period_label,
@@ -210,10 +270,8 @@ def display_candlestick_chart(coin_id, currency, days):
                       delta=f"{sign}{abs(change_pct):.2f}%",
                       delta_color="normal")
         with col3:
-            highest = candlestick_data['high'].max()
             st.metric("⬆️ Period High", fmt.format_price(highest, currency))
         with col4:
-            lowest = candlestick_data['low'].min()
             st.metric("⬇️ Period Low", fmt.format_price(lowest, currency))
     else:
         st.warning(f"No historical data found for {coin_id}.")
\ No newline at end of file
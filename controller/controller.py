@@ -7,12 +7,18 @@ import logging
 from model.CryptoDataProvider import CryptoDataProvider, VALID_OHLC_DAYS
 from model.GeminiChat import GeminiChat
 
-# Configuração básica de logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Logger do módulo; a configuração de logging é feita no ponto de entrada (main.py)
 logger = logging.getLogger(__name__)
 
-# Instância única do chatbot Gemini (usa as secrets do Streamlit)
-_gemini_chat = GeminiChat()
+# Instância única do chatbot Gemini, criada no primeiro uso (usa as secrets do Streamlit)
+_gemini_chat = None
+
+def _get_gemini_chat():
+    """Create the Gemini chatbot on first use so app start-up does not wait on model discovery."""
+    global _gemini_chat
+    if _gemini_chat is None:
+        _gemini_chat = GeminiChat()
+    return _gemini_chat
 
 def get_live_data(currency="usd"):
     """
@@ -55,7 +61,7 @@ def ask_chatbot(question, live_data=None, currency="USD"):
         str: chatbot's response
     """
     try:
-        return _gemini_chat.get_response(question, live_data, currency)
+        return _get_gemini_chat().get_response(question, live_data, currency)
     except Exception as e:
         logger.error(f"Error in ask_chatbot: {e}")
         return f"Sorry, an error occurred: {str(e)}"
\ No newline at end of file
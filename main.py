@@ -1,7 +1,10 @@
+import logging
 import streamlit as st
 from app import run_app
 
 if __name__ == "__main__":
+    # Configure logging once, at the entry point, instead of on module import
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     try:
         run_app()
     except Exception as e:
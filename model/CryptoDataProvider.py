@@ -1,49 +1,138 @@
+import numpy as np
 import pandas as pd
 import requests
 import logging
+from bisect import bisect_left
+from datetime import datetime
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from model.FileCache import FileCache
+
+# orjson decodes CoinGecko payloads faster; fall back to the standard library if it is missing
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+logger = logging.getLogger(__name__)
+
 # Global constants
 VALID_OHLC_DAYS = [1, 7, 14, 30, 90, 180, 365, "max"]
+_OHLC_DAY_RANGES = tuple(VALID_OHLC_DAYS[:-1])  # sorted numeric ranges, for bisect
+
+OHLC_PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+# Fields of the /coins/markets response used by the table and the chatbot; the rest are dropped
+MARKET_COLUMNS = [
+    "market_cap_rank", "name", "image", "symbol", "current_price", "market_cap",
+    "circulating_supply", "total_volume", "ath", "ath_change_percentage", "ath_date",
+    "price_change_percentage_24h",
+]
+
+# Numeric fields of the /coins/markets response, cast once at ingest
+MARKET_DTYPES = {
+    "current_price": "float64",
+    "market_cap": "float64",
+    "total_volume": "float64",
+    "circulating_supply": "float64",
+    "ath": "float64",
+    "ath_change_percentage": "float64",
+    "price_change_percentage_24h": "float64",
+}
+
+class _CappedRetry(Retry):
+    """Retry policy that never sleeps longer than MAX_RETRY_AFTER seconds on a Retry-After header."""
+
+    # Requests run in the script thread under Streamlit's cache lock, so a long
+    # Retry-After would stall every session; give up quickly and show the warning instead
+    MAX_RETRY_AFTER = 2
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.MAX_RETRY_AFTER)
 
 class CryptoDataProvider:
     """Handles all interactions with the CoinGecko API."""
 
     BASE_URL = "https://api.coingecko.com/api/v3/"
 
+    # On-disk DataFrame cache and its freshness windows (seconds).
+    # Bump the version whenever the columns or dtypes of the cached frames change.
+    # The app caches live data for another minute on top, so only near-fresh files are reused.
+    CACHE = FileCache(version=3)
+    LIVE_DATA_FILE_TTL = 5
+    OHLC_TTL = 300
+
+    # (connect, read) timeouts in seconds, so a stalled socket cannot block a rerun indefinitely
+    REQUEST_TIMEOUT = (3.05, 10)
+
+    # Shared HTTP session so keep-alive connections to CoinGecko are reused across calls
+    _session = None
+
     @staticmethod
     def closest_valid_days(days):
-        """Find the closest valid OHLC time range."""
-        return min(VALID_OHLC_DAYS[:-1], key=lambda x: abs(x - days))
+        """Find the closest valid OHLC time range (ties go to the shorter range)."""
+        i = bisect_left(_OHLC_DAY_RANGES, days)
+        if i == 0:
+            return _OHLC_DAY_RANGES[0]
+        if i == len(_OHLC_DAY_RANGES):
+            return _OHLC_DAY_RANGES[-1]
+        lower, upper = _OHLC_DAY_RANGES[i - 1], _OHLC_DAY_RANGES[i]
+        return upper if upper - days < days - lower else lower
 
     @staticmethod
     def requests_retry_session(retries=3, backoff_factor=0.3,
-                               status_forcelist=(500, 502, 503, 504)):
-        """Create a requests session with retry strategy."""
+                               status_forcelist=(429, 500, 502, 503, 504)):
+        """Create a requests session with retry strategy (honours CoinGecko's Retry-After on 429, capped)."""
         session = requests.Session()
-        retry = Retry(
+        retry = _CappedRetry(
             total=retries,
             read=retries,
             connect=retries,
             backoff_factor=backoff_factor,
-            status_forcelist=status_forcelist
+            status_forcelist=status_forcelist,
+            respect_retry_after_header=True
         )
-        adapter = HTTPAdapter(max_retries=retry)
+        # Keep idle keep-alive sockets to api.coingecko.com for concurrent Streamlit sessions
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
         session.mount("https://", adapter)
         return session
 
+    @classmethod
+    def session(cls):
+        """Return the shared retrying session, creating it on first use."""
+        if cls._session is None:
+            cls._session = cls.requests_retry_session()
+        return cls._session
+
+    @classmethod
+    def get_json(cls, url):
+        """GET a CoinGecko endpoint and return the decoded JSON body (raises ValueError on a malformed body)."""
+        response = cls.session().get(url, timeout=cls.REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return json_loads(response.content)
+
     @classmethod
     def fetch_crypto_data(cls, currency="usd"):
-        """Fetch real-time cryptocurrency prices."""
+        """Fetch real-time cryptocurrency prices; `df.attrs["fetched_at"]` holds when they were fetched."""
         url = f"{cls.BASE_URL}coins/markets?vs_currency={currency}&order=market_cap_desc&per_page=10&page=1"
+        df = cls.CACHE.load(url, cls.LIVE_DATA_FILE_TTL)
+        if df is not None:
+            return df
         try:
-            session = cls.requests_retry_session()
-            response = session.get(url)
-            response.raise_for_status()
-            return pd.DataFrame(response.json())
-        except requests.RequestException as e:
-            logging.error(f"Error fetching cryptocurrency data: {e}")
+            df = pd.DataFrame.from_records(cls.get_json(url), columns=MARKET_COLUMNS)
+            df = df.astype(MARKET_DTYPES)
+            # Parse ISO-8601 dates once at ingest so the cached frame is already typed
+            df["ath_date"] = pd.to_datetime(df["ath_date"], utc=True, format="ISO8601")
+            cls.CACHE.save(url, df)
+            # Stamped after saving: the cache records the fetch time as the file's mtime instead
+            df.attrs["fetched_at"] = datetime.now()
+            return df
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Error fetching cryptocurrency data: {e}")
             return None
 
     @classmethod
@@ -51,15 +140,21 @@ class CryptoDataProvider:
         """Fetch historical OHLC prices."""
         valid_days = cls.closest_valid_days(days)
         url = f"{cls.BASE_URL}coins/{coin_id}/ohlc?vs_currency={currency}&days={valid_days}"
+        df = cls.CACHE.load(url, cls.OHLC_TTL)
+        if df is not None:
+            return df
         try:
-            session = cls.requests_retry_session()
-            response = session.get(url)
-            response.raise_for_status()
-            data = response.json()
-            df = pd.DataFrame(data, columns=["timestamp", "open", "high", "low", "close"])
-            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-            logging.info(f"Fetched OHLC data for {coin_id}: {valid_days} days")
+            # Rows are [timestamp, open, high, low, close]; build the columns from one float64 array
+            arr = np.asarray(cls.get_json(url), dtype=np.float64).reshape(-1, 5)
+            df = pd.DataFrame({
+                # CoinGecko timestamps are epoch milliseconds: reinterpret them, no conversion pass
+                "timestamp": arr[:, 0].astype("int64").view("datetime64[ms]"),
+                # float32 keeps ~7 significant digits, plenty for charting, at half the payload size
+                **{col: arr[:, i + 1].astype("float32") for i, col in enumerate(OHLC_PRICE_COLUMNS)},
+            })
+            logger.info(f"Fetched OHLC data for {coin_id}: {valid_days} days")
+            cls.CACHE.save(url, df)
             return df
-        except requests.RequestException as e:
-            logging.error(f"Error fetching candlestick data for {coin_id}: {e}")
-            return None
\ No newline at end of file
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Error fetching candlestick data for {coin_id}: {e}")
+            return None
@@ -0,0 +1,59 @@
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class FileCache:
+    """Persists API results on disk as Parquet so they survive restarts and are shared between workers."""
+
+    def __init__(self, cache_dir=".cache", version=1):
+        """`version` is part of every key; bump it to invalidate entries written in an older layout."""
+        self.cache_dir = cache_dir
+        self.version = version
+
+    def _path(self, key):
+        """Map a cache key (e.g. a request URL) to its file inside the cache directory."""
+        digest = hashlib.md5(f"v{self.version}:{key}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.parquet")
+
+    def load(self, key, ttl):
+        """
+        Return the stored DataFrame for `key`, or None if missing or older than `ttl` seconds.
+        The time the entry was written is recorded in `df.attrs["fetched_at"]`.
+        """
+        path = self._path(key)
+        try:
+            mtime = os.path.getmtime(path)
+            if time.time() - mtime > ttl:
+                return None
+            df = pd.read_parquet(path)
+            df.attrs["fetched_at"] = datetime.fromtimestamp(mtime)
+            return df
+        except OSError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read cache entry {path}: {e}")
+            return None
+
+    def save(self, key, df):
+        """Store a DataFrame for `key`; failures are logged and otherwise ignored."""
+        path = self._path(key)
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Unique temp file per writer, so concurrent workers never write into the same file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            os.close(fd)
+            df.to_parquet(tmp_path, compression="zstd", index=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write cache entry {path}: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
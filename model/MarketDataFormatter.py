@@ -1,20 +1,48 @@
+import numpy as np
+import pandas as pd
+
+# Currency code -> display symbol; look up with currency.upper()
+CURRENCY_SYMBOLS = {"USD": "$", "EUR": "€", "GBP": "£"}
+
+# (threshold, suffix) pairs for format_large_number, largest first
+_LARGE_NUMBER_SCALES = ((1e9, "B"), (1e6, "M"), (1e3, "K"))
+
+
 class MarketDataFormatter:
     """Utility class for formatting market data for display."""
 
     @staticmethod
     def format_price(price, currency="USD"):
         """Format price with currency symbol."""
-        symbols = {"usd": "$", "eur": "€", "gbp": "£", "USD": "$", "EUR": "€", "GBP": "£"}
-        symbol = symbols.get(currency, "$")
+        symbol = CURRENCY_SYMBOLS.get(currency.upper(), "$")
         return f"{symbol}{price:,.2f}"
 
     @staticmethod
     def format_large_number(num):
         """Format large numbers with K, M, B suffixes."""
-        if num >= 1e9:
-            return f"{num/1e9:.2f}B"
-        elif num >= 1e6:
-            return f"{num/1e6:.2f}M"
-        elif num >= 1e3:
-            return f"{num/1e3:.2f}K"
-        return f"{num:.2f}"
\ No newline at end of file
+        for threshold, suffix in _LARGE_NUMBER_SCALES:
+            if num >= threshold:
+                return f"{num / threshold:.2f}{suffix}"
+        return f"{num:.2f}"
+
+    @staticmethod
+    def format_currency(value, currency="USD", decimals=2):
+        """Format a currency value with symbol and thousand separators."""
+        symbol = CURRENCY_SYMBOLS.get(currency.upper(), "$")
+        return f"{symbol}{value:,.{decimals}f}"
+
+    @staticmethod
+    def format_price_series(series, currency="USD", decimals=2):
+        """Format a whole Series of values with currency symbol in a single pass."""
+        symbol = CURRENCY_SYMBOLS.get(currency.upper(), "$")
+        fmt = f"{symbol}{{:,.{decimals}f}}".format
+        return pd.Series([fmt(v) for v in series.to_numpy()], index=series.index)
+
+    @staticmethod
+    def format_large_number_series(series):
+        """Format a whole Series of large numbers with K, M, B suffixes."""
+        values = series.to_numpy(dtype="float64")
+        conditions = [values >= 1e9, values >= 1e6, values >= 1e3]
+        scaled = np.select(conditions, [values / 1e9, values / 1e6, values / 1e3], default=values)
+        suffixes = np.select(conditions, ["B", "M", "K"], default="")
+        return pd.Series([f"{v:.2f}{suffix}" for v, suffix in zip(scaled, suffixes)], index=series.index)
@@ -3,40 +3,29 @@ View layer for Cryptocurrency Dashboard.
 Handles all data visualization components and formatting utilities.
 """
 
+import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
-import streamlit as st
-
-# FORMATTING UTILITIES
-
-class MarketDataFormatter:
-    """Utility class for formatting market data for display."""
-
-    @staticmethod
-    def format_price(price, currency="USD"):
-        """Format price with currency symbol."""
-        symbols = {"usd": "$", "eur": "€", "USD": "$", "EUR": "€"}
-        symbol = symbols.get(currency, "$")
-        return f"{symbol}{price:,.2f}"
-
-    @staticmethod
-    def format_large_number(num):
-        """Format large numbers with K, M, B suffixes."""
-        if num >= 1e9:
-            return f"{num/1e9:.2f}B"
-        elif num >= 1e6:
-            return f"{num/1e6:.2f}M"
-        elif num >= 1e3:
-            return f"{num/1e3:.2f}K"
-        return f"{num:.2f}"
-    
-    @staticmethod
-    def format_currency(value, currency="USD", decimals=2):
-        """Format a currency value with symbol and thousand separators."""
-        symbols = {"usd": "$", "eur": "€", "USD": "$", "EUR": "€"}
-        symbol = symbols.get(currency, "$")
-        return f"{symbol}{value:,.{decimals}f}"
+import plotly.io as pio
 
+# Formatting utilities live in the model layer; re-exported here for view code
+from model.MarketDataFormatter import CURRENCY_SYMBOLS, MarketDataFormatter
+
+# Upper bound on candles sent to the browser; longer series are merged into wider candles
+MAX_CANDLES = 500
+
+# Dashboard template (plotly_white with unified hover), registered once at import
+# so figures reference it by name instead of carrying their own layout defaults
+TEMPLATE = "crypto"
+_crypto_template = go.layout.Template(pio.templates["plotly_white"])
+_crypto_template.layout.hovermode = "x unified"
+pio.templates[TEMPLATE] = _crypto_template
+
+# Shared Plotly styling, built once at import (Plotly copies these on assignment)
+_TITLE_STYLE = {'y': 0.95, 'x': 0.5, 'xanchor': 'center', 'yanchor': 'top', 'font': {'size': 24}}
+_LEGEND_TOP_LEFT = dict(yanchor="top", y=0.99, xanchor="left", x=0.01)
+_CHART_MARGIN = dict(t=80, b=50, l=50, r=50)
+_SMALL_CHART_MARGIN = dict(t=50, b=50, l=50, r=50)
+_AXIS_STYLE = dict(gridcolor='lightgray', showline=True, linewidth=1, linecolor='black')
 
 # CHART CREATION FUNCTIONS
 
@@ -52,12 +41,17 @@ def create_candlestick_chart(data, coin_name, currency="USD"):
     Returns:
         plotly.graph_objects.Figure: Candlestick chart
     """
-    if data is None or data.empty:
+    if data is None:
+        return create_empty_chart("No data available")
+
+    data = _sanitize_series(data, ["timestamp", "open", "high", "low", "close"])
+    if len(data) == 0:
         return create_empty_chart("No data available")
 
+    data = _downsample_ohlc(data)
+
     # Determine currency symbol
-    symbols = {"USD": "$", "EUR": "€"}
-    symbol = symbols.get(currency.upper(), "$")
+    symbol = CURRENCY_SYMBOLS.get(currency.upper(), "$")
 
     # Create candlestick trace
     candlestick = go.Candlestick(
@@ -81,52 +75,65 @@ def create_candlestick_chart(data, coin_name, currency="USD"):
         opacity=0.5
     )
 
-    # Create figure
-    fig = go.Figure(data=[candlestick, line_trace])
-
-    # Update layout
-    fig.update_layout(
-        title={
-            'text': f'{coin_name.capitalize()} - Candlestick Chart',
-            'y': 0.95,
-            'x': 0.5,
-            'xanchor': 'center',
-            'yanchor': 'top',
-            'font': {'size': 24}
-        },
-        xaxis_title="Date",
-        yaxis_title=f"Price ({currency.upper()})",
-        xaxis_rangeslider_visible=False,
-        template="plotly_white",
-        hovermode="x unified",
-        height=600,
-        margin=dict(t=80, b=50, l=50, r=50),
-        legend=dict(
-            yanchor="top",
-            y=0.99,
-            xanchor="left",
-            x=0.01
+    # Create figure with its whole layout in one pass
+    fig = go.Figure(
+        data=[candlestick, line_trace],
+        layout=dict(
+            template=TEMPLATE,
+            title={**_TITLE_STYLE, 'text': f'{coin_name.capitalize()} - Candlestick Chart'},
+            xaxis=dict(title="Date", rangeslider_visible=False, tickformat="%b %d\n%H:%M", **_AXIS_STYLE),
+            yaxis=dict(title=f"Price ({currency.upper()})", tickprefix=symbol, **_AXIS_STYLE),
+            height=600,
+            margin=_CHART_MARGIN,
+            legend=_LEGEND_TOP_LEFT
         )
     )
 
-    # Update axis properties
-    fig.update_xaxes(
-        tickformat="%b %d\n%H:%M",
-        gridcolor='lightgray',
-        showline=True,
-        linewidth=1,
-        linecolor='black'
-    )
+    return fig
 
-    fig.update_yaxes(
-        tickprefix=symbol,
-        gridcolor='lightgray',
-        showline=True,
-        linewidth=1,
-        linecolor='black'
-    )
 
-    return fig
+def _sanitize_series(data, columns):
+    """
+    Drop rows with missing values and order by timestamp, so downsampling and
+    Plotly get clean, sorted input. Already clean data is returned as is.
+
+    Args:
+        data (DataFrame): Data with a timestamp column
+        columns (list): Columns that must not contain missing values
+
+    Returns:
+        DataFrame: Rows without missing values, sorted by timestamp
+    """
+    if data[columns].isna().to_numpy().any():
+        data = data.dropna(subset=columns)
+    if not data["timestamp"].is_monotonic_increasing:
+        data = data.sort_values("timestamp", ignore_index=True)
+    return data
+
+
+def _downsample_ohlc(data, max_candles=MAX_CANDLES):
+    """
+    Merge consecutive candles so that at most `max_candles` are plotted.
+
+    Args:
+        data (DataFrame): OHLC data with columns: timestamp, open, high, low, close
+        max_candles (int): Maximum number of candles to keep
+
+    Returns:
+        DataFrame: The original data, or the aggregated candles if it was too long
+    """
+    if len(data) <= max_candles:
+        return data
+
+    step = -(-len(data) // max_candles)  # ceiling division
+    buckets = np.arange(len(data)) // step
+    return data.groupby(buckets).agg(
+        timestamp=("timestamp", "first"),
+        open=("open", "first"),
+        high=("high", "max"),
+        low=("low", "min"),
+        close=("close", "last"),
+    ).reset_index(drop=True)
 
 
 def create_price_line_chart(data, title="Cryptocurrency Prices", currency="USD"):
@@ -141,11 +148,17 @@ def create_price_line_chart(data, title="Cryptocurrency Prices", currency="USD")
     Returns:
         plotly.graph_objects.Figure: Line chart
     """
-    if data is None or data.empty:
+    if data is None:
         return create_empty_chart("No data available")
 
-    symbols = {"USD": "$", "EUR": "€"}
-    symbol = symbols.get(currency.upper(), "$")
+    data = _sanitize_series(data, ["timestamp", "close"])
+    if len(data) == 0:
+        return create_empty_chart("No data available")
+
+    # Imported lazily: plotly.express is heavy and the dashboard itself only draws candlesticks
+    import plotly.express as px
+
+    symbol = CURRENCY_SYMBOLS.get(currency.upper(), "$")
 
     fig = px.line(
         data,
@@ -156,14 +169,14 @@ def create_price_line_chart(data, title="Cryptocurrency Prices", currency="USD")
             "timestamp": "Date",
             "close": f"Price ({currency.upper()})"
         },
-        color_discrete_sequence=['#4169E1']  # Royal blue
+        color_discrete_sequence=['#4169E1'],  # Royal blue
+        template=TEMPLATE
     )
 
     fig.update_layout(
-        template="plotly_white",
-        hovermode="x unified",
         height=400,
-        margin=dict(t=50, b=50, l=50, r=50)
+        margin=_SMALL_CHART_MARGIN,
+        yaxis_tickprefix=symbol
     )
 
     fig.update_traces(
@@ -172,9 +185,6 @@ def create_price_line_chart(data, title="Cryptocurrency Prices", currency="USD")
         line=dict(width=2)
     )
 
-    # Update y-axis tick prefix
-    fig.update_yaxes(tickprefix=symbol)
-
     return fig
 
 
@@ -200,9 +210,9 @@ def create_empty_chart(message="No data available"):
             'showarrow': False,
             'font': {'size': 20}
         }],
-        template="plotly_white",
+        template=TEMPLATE,
         height=400,
-        margin=dict(t=50, b=50, l=50, r=50)
+        margin=_SMALL_CHART_MARGIN
     )
 
     return fig
\ No newline at end of file